@@ -0,0 +1,98 @@
+-- Atomic rate limit check shared by every API worker.
+-- KEYS[1]: limiter state key
+-- ARGV[1]: algorithm, ARGV[2]: max_requests, ARGV[3]: window_seconds
+-- Returns {allowed (1/0), remaining}
+
+local algorithm = ARGV[1]
+local max_requests = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+
+-- Redis server time, so all workers share one clock
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local window_ms = math.ceil(window * 1000)
+
+if algorithm == 'token_bucket' then
+    local rate = max_requests / window
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'last_refill')
+    local tokens = tonumber(state[1]) or max_requests
+    local last_refill = tonumber(state[2]) or now
+
+    -- Refill tokens based on elapsed time
+    tokens = math.min(max_requests, tokens + (now - last_refill) * rate)
+
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', string.format('%.17g', tokens),
+        'last_refill', string.format('%.17g', now))
+    -- An idle bucket is full again after one window
+    redis.call('PEXPIRE', KEYS[1], window_ms)
+    return {allowed, math.floor(tokens)}
+
+elseif algorithm == 'leaky_bucket' then
+    local rate = max_requests / window
+    local state = redis.call('HMGET', KEYS[1], 'level', 'last_leak')
+    local level = tonumber(state[1]) or 0
+    local last_leak = tonumber(state[2]) or now
+
+    -- Leak requests based on elapsed time
+    level = math.max(0, level - (now - last_leak) * rate)
+
+    local allowed = 0
+    if level + 1 <= max_requests then
+        level = level + 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'level', string.format('%.17g', level),
+        'last_leak', string.format('%.17g', now))
+    -- An idle bucket has drained completely after one window
+    redis.call('PEXPIRE', KEYS[1], window_ms)
+    return {allowed, math.floor(max_requests - level)}
+
+elseif algorithm == 'fixed_window' then
+    -- The counter key expires when its window ends
+    local counter = tonumber(redis.call('GET', KEYS[1]) or '0')
+    if counter < max_requests then
+        counter = redis.call('INCR', KEYS[1])
+        if counter == 1 then
+            redis.call('PEXPIRE', KEYS[1], window_ms)
+        end
+        return {1, max_requests - counter}
+    end
+    return {0, 0}
+
+elseif algorithm == 'sliding_window' then
+    -- Weighted counter across the current and previous window, the same
+    -- algorithm as SlidingWindowCounter in rate_limiters.py
+    local state = redis.call('HMGET', KEYS[1], 'current', 'previous', 'window_start')
+    local current = tonumber(state[1]) or 0
+    local previous = tonumber(state[2]) or 0
+    local window_start = tonumber(state[3]) or now
+    local elapsed = now - window_start
+
+    -- Move to new window if needed
+    if elapsed >= window then
+        previous = current
+        current = 0
+        window_start = now
+        elapsed = 0
+    end
+
+    local estimated = previous * (window - elapsed) / window + current
+    local allowed = 0
+    if estimated < max_requests then
+        current = current + 1
+        estimated = estimated + 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'current', current, 'previous', previous,
+        'window_start', string.format('%.17g', window_start))
+    -- The previous window's count still weighs in for one more window
+    redis.call('PEXPIRE', KEYS[1], 2 * window_ms)
+    return {allowed, math.max(0, math.floor(max_requests - estimated))}
+end
+
+return {0, 0}
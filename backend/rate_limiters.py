@@ -0,0 +1,150 @@
+"""
+Rate limiting algorithms.
+
+Kept free of I/O and fully typed so the module can be compiled to a C
+extension with mypyc (``mypyc rate_limiters.py``). The compiled module is
+picked up by ``import rate_limiters`` ahead of this source file.
+"""
+
+from typing import Final
+
+
+class TokenBucket:
+    """Token Bucket Algorithm - Tokens refill at a constant rate"""
+    # Fraction of a token ignored when comparing, to absorb float rounding
+    # in the time arithmetic
+    TOLERANCE: Final = 1e-3
+    
+    __slots__ = ("capacity", "refill_rate", "available_at")
+    capacity: int
+    refill_rate: float
+    available_at: float
+    
+    def __init__(self, capacity: int, refill_rate: float, now: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # tokens per second
+        # Time at which the bucket was last empty; tokens are derived from it
+        # on demand, so a new bucket starts full
+        self.available_at = now - capacity / refill_rate
+    
+    def consume(self, now: float, tokens: int = 1) -> bool:
+        # A bucket can't hold more than capacity, however long it sat idle
+        available_at = max(self.available_at, now - self.capacity / self.refill_rate)
+        
+        if (now - available_at) * self.refill_rate + self.TOLERANCE >= tokens:
+            self.available_at = available_at + tokens / self.refill_rate
+            return True
+        return False
+    
+    def get_remaining(self, now: float) -> int:
+        current_tokens = min(self.capacity, (now - self.available_at) * self.refill_rate + self.TOLERANCE)
+        return int(current_tokens)
+
+class LeakyBucket:
+    """Leaky Bucket Algorithm - Processes requests at constant rate"""
+    __slots__ = ("capacity", "level", "leak_rate", "last_leak")
+    capacity: int
+    level: float
+    leak_rate: float
+    last_leak: float
+    
+    def __init__(self, capacity: int, leak_rate: float, now: float):
+        self.capacity = capacity
+        self.level = 0.0  # requests currently in the bucket
+        self.leak_rate = leak_rate  # requests per second
+        self.last_leak = now
+    
+    def add_request(self, now: float) -> bool:
+        elapsed = now - self.last_leak
+        
+        # Leak requests based on elapsed time
+        self.level = max(0.0, self.level - elapsed * self.leak_rate)
+        self.last_leak = now
+        
+        if self.level + 1.0 <= self.capacity:
+            self.level += 1.0
+            return True
+        return False
+    
+    def get_remaining(self, now: float) -> int:
+        elapsed = now - self.last_leak
+        current_level = max(0.0, self.level - elapsed * self.leak_rate)
+        return int(self.capacity - current_level)
+
+class FixedWindow:
+    """Fixed Window Counter - Resets counter at fixed intervals"""
+    __slots__ = ("max_requests", "window_seconds", "counter", "window_start")
+    max_requests: int
+    window_seconds: int
+    counter: int
+    window_start: float
+    
+    def __init__(self, max_requests: int, window_seconds: int, now: float):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.counter = 0
+        self.window_start = now
+    
+    def allow_request(self, now: float) -> bool:
+        # Check if window expired
+        if now - self.window_start >= self.window_seconds:
+            self.counter = 0
+            self.window_start = now
+        
+        if self.counter < self.max_requests:
+            self.counter += 1
+            return True
+        return False
+    
+    def get_remaining(self, now: float) -> int:
+        if now - self.window_start >= self.window_seconds:
+            return self.max_requests
+        return max(0, self.max_requests - self.counter)
+
+class SlidingWindowCounter:
+    """Sliding Window Counter - Weighted counter across windows"""
+    __slots__ = (
+        "max_requests", "window_seconds", "current_window_count",
+        "previous_window_count", "current_window_start"
+    )
+    max_requests: int
+    window_seconds: int
+    current_window_count: int
+    previous_window_count: int
+    current_window_start: float
+    
+    def __init__(self, max_requests: int, window_seconds: int, now: float):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.current_window_count = 0
+        self.previous_window_count = 0
+        self.current_window_start = now
+    
+    def allow_request(self, now: float) -> bool:
+        elapsed = now - self.current_window_start
+        
+        # Move to new window if needed
+        if elapsed >= self.window_seconds:
+            self.previous_window_count = self.current_window_count
+            self.current_window_count = 0
+            self.current_window_start = now
+            elapsed = 0.0
+        
+        # Calculate weighted count
+        weight = (self.window_seconds - elapsed) / self.window_seconds
+        estimated_count = self.previous_window_count * weight + self.current_window_count
+        
+        if estimated_count < self.max_requests:
+            self.current_window_count += 1
+            return True
+        return False
+    
+    def get_remaining(self, now: float) -> int:
+        elapsed = now - self.current_window_start
+        
+        if elapsed >= self.window_seconds:
+            return self.max_requests
+        
+        weight = (self.window_seconds - elapsed) / self.window_seconds
+        estimated_count = self.previous_window_count * weight + self.current_window_count
+        return max(0, int(self.max_requests - estimated_count))
@@ -1,8 +1,10 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import ConnectionFailure
+import redis.asyncio as aioredis
 import os
 import logging
 from pathlib import Path
@@ -12,20 +14,42 @@ import uuid
 from datetime import datetime, timezone, timedelta
 import time
 import asyncio
-from functools import wraps
-from collections import deque
+from functools import wraps, cached_property
 import math
+from cachetools import LRUCache, TTLCache
+from rate_limiters import TokenBucket, LeakyBucket, FixedWindow, SlidingWindowCounter
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection. Timestamps are stored as BSON dates and read back
+# as timezone-aware UTC datetimes. The pool is sized explicitly and kept
+# warm so requests don't queue on checkout or pay for a cold connect.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    tz_aware=True,
+    maxPoolSize=50,
+    minPoolSize=10,
+    waitQueueTimeoutMS=2000,
+    serverSelectionTimeoutMS=2000
+)
 db = client[os.environ['DB_NAME']]
+MONGO_CONNECT_ATTEMPTS = 10
+MONGO_CONNECT_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+MONGO_CONNECT_MAX_BACKOFF = 5.0  # seconds
+
+# Optional Redis connection. When REDIS_URL is set, rate limit state lives
+# in Redis and is shared by all workers; otherwise it is kept in-process.
+redis_url = os.environ.get('REDIS_URL')
+redis_client = aioredis.from_url(redis_url) if redis_url else None
+rate_limit_script = (
+    redis_client.register_script((ROOT_DIR / 'rate_limit.lua').read_text())
+    if redis_client else None
+)
 
 # Create the main app without a prefix
-app = FastAPI(title="Rate Limiter System")
+app = FastAPI(title="Rate Limiter System", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -41,19 +65,34 @@ print("CORS middleware configured to allow http://localhost:3000")
 api_router = APIRouter(prefix="/api")
 
 
-# In-memory storage for rate limiting (for demo purposes)
-# In production, use Redis or similar distributed cache
+# In-memory storage for rate limiting, used when Redis is not configured.
+# Bounded by count only: every lookup marks a limiter as recently used, and
+# only the least recently used ones are dropped once the cache is full, so
+# limiters in use are never reset regardless of how long their window is.
+LIMITER_CACHE_SIZE = 100_000
 rate_limit_storage = {}
-token_buckets = {}
-leaky_buckets = {}
-fixed_windows = {}
-sliding_windows = {}
+token_buckets = LRUCache(maxsize=LIMITER_CACHE_SIZE)
+leaky_buckets = LRUCache(maxsize=LIMITER_CACHE_SIZE)
+fixed_windows = LRUCache(maxsize=LIMITER_CACHE_SIZE)
+sliding_windows = LRUCache(maxsize=LIMITER_CACHE_SIZE)
+
+# Request logs are buffered here and written to MongoDB in batches
+# by a background task instead of one insert per request. The queue is
+# bounded so a MongoDB outage can't grow it without limit; logs that
+# don't fit are dropped and counted.
+LOG_QUEUE_SIZE = 100_000
+log_queue: asyncio.Queue = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+LOG_FLUSH_INTERVAL = 0.05  # seconds
+LOG_BATCH_SIZE = 500
+LOG_DROP_WARN_INTERVAL = 10  # seconds between warnings about dropped logs
+log_writer_task: Optional[asyncio.Task] = None
+dropped_log_count = 0  # logs dropped since the last warning
 
 # ==================== MODELS ====================
 
 class APIKeyModel(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     api_key: str = Field(default_factory=lambda: f"api_key_{uuid.uuid4().hex}")
     name: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -61,16 +100,21 @@ class APIKeyModel(BaseModel):
 
 class RateLimitConfig(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     api_key: str
     algorithm: str  # token_bucket, leaky_bucket, fixed_window, sliding_window
     max_requests: int
     window_seconds: int
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    
+    @cached_property
+    def rate(self) -> float:
+        """Average allowed requests per second (bucket refill/leak rate)"""
+        return self.max_requests / self.window_seconds
 
 class RequestLog(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     api_key: str
     endpoint: str
     algorithm: str
@@ -93,146 +137,108 @@ class RateLimitConfigCreate(BaseModel):
     max_requests: int
     window_seconds: int
 
-# ==================== RATE LIMITING ALGORITHMS ====================
-
-class TokenBucket:
-    """Token Bucket Algorithm - Tokens refill at a constant rate"""
-    def __init__(self, capacity: int, refill_rate: float):
-        self.capacity = capacity
-        self.tokens = capacity
-        self.refill_rate = refill_rate  # tokens per second
-        self.last_refill = time.time()
-    
-    def consume(self, tokens: int = 1) -> bool:
-        now = time.time()
-        elapsed = now - self.last_refill
-        
-        # Refill tokens based on elapsed time
-        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
-        self.last_refill = now
-        
-        if self.tokens >= tokens:
-            self.tokens -= tokens
-            return True
-        return False
-    
-    def get_remaining(self) -> int:
-        now = time.time()
-        elapsed = now - self.last_refill
-        current_tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
-        return int(current_tokens)
-
-class LeakyBucket:
-    """Leaky Bucket Algorithm - Processes requests at constant rate"""
-    def __init__(self, capacity: int, leak_rate: float):
-        self.capacity = capacity
-        self.queue = deque()
-        self.leak_rate = leak_rate  # requests per second
-        self.last_leak = time.time()
-    
-    def add_request(self) -> bool:
-        now = time.time()
-        elapsed = now - self.last_leak
-        
-        # Leak requests based on elapsed time
-        leaks = int(elapsed * self.leak_rate)
-        for _ in range(min(leaks, len(self.queue))):
-            if self.queue:
-                self.queue.popleft()
-        self.last_leak = now
-        
-        if len(self.queue) < self.capacity:
-            self.queue.append(now)
-            return True
-        return False
-    
-    def get_remaining(self) -> int:
-        now = time.time()
-        elapsed = now - self.last_leak
-        leaks = int(elapsed * self.leak_rate)
-        current_size = max(0, len(self.queue) - leaks)
-        return self.capacity - current_size
-
-class FixedWindow:
-    """Fixed Window Counter - Resets counter at fixed intervals"""
-    def __init__(self, max_requests: int, window_seconds: int):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.counter = 0
-        self.window_start = time.time()
-    
-    def allow_request(self) -> bool:
-        now = time.time()
+# Algorithm name -> (limiter storage, factory, allow method, remaining method)
+RATE_LIMITERS = {
+    "token_bucket": (
+        token_buckets,
+        lambda config, now: TokenBucket(config.max_requests, config.rate, now),
+        TokenBucket.consume,
+        TokenBucket.get_remaining
+    ),
+    "leaky_bucket": (
+        leaky_buckets,
+        lambda config, now: LeakyBucket(config.max_requests, config.rate, now),
+        LeakyBucket.add_request,
+        LeakyBucket.get_remaining
+    ),
+    "fixed_window": (
+        fixed_windows,
+        lambda config, now: FixedWindow(config.max_requests, config.window_seconds, now),
+        FixedWindow.allow_request,
+        FixedWindow.get_remaining
+    ),
+    "sliding_window": (
+        sliding_windows,
+        lambda config, now: SlidingWindowCounter(config.max_requests, config.window_seconds, now),
+        SlidingWindowCounter.allow_request,
+        SlidingWindowCounter.get_remaining
+    ),
+}
+
+# ==================== REQUEST LOG WRITER ====================
+
+async def flush_request_logs():
+    """Write all queued request logs to MongoDB in batches"""
+    while not log_queue.empty():
+        batch = []
+        while not log_queue.empty() and len(batch) < LOG_BATCH_SIZE:
+            batch.append(log_queue.get_nowait())
+        # Awaited so at most one insert is in flight; while MongoDB is slow,
+        # logs accumulate in the queue instead of as concurrent inserts
+        await db.request_logs.insert_many(batch, ordered=False)
+
+async def request_log_writer():
+    """Periodically flush the request log queue"""
+    global dropped_log_count
+    last_drop_warning = time.monotonic()
+    while True:
+        await asyncio.sleep(LOG_FLUSH_INTERVAL)
+        try:
+            await flush_request_logs()
+        except Exception as e:
+            logger.error(f"Failed to write request logs: {e}")
         
-        # Check if window expired
-        if now - self.window_start >= self.window_seconds:
-            self.counter = 0
-            self.window_start = now
-        
-        if self.counter < self.max_requests:
-            self.counter += 1
-            return True
-        return False
-    
-    def get_remaining(self) -> int:
-        now = time.time()
-        if now - self.window_start >= self.window_seconds:
-            return self.max_requests
-        return max(0, self.max_requests - self.counter)
-
-class SlidingWindowCounter:
-    """Sliding Window Counter - Weighted counter across windows"""
-    def __init__(self, max_requests: int, window_seconds: int):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.current_window_count = 0
-        self.previous_window_count = 0
-        self.current_window_start = time.time()
-    
-    def allow_request(self) -> bool:
-        now = time.time()
-        elapsed = now - self.current_window_start
-        
-        # Move to new window if needed
-        if elapsed >= self.window_seconds:
-            self.previous_window_count = self.current_window_count
-            self.current_window_count = 0
-            self.current_window_start = now
-            elapsed = 0
-        
-        # Calculate weighted count
-        weight = (self.window_seconds - elapsed) / self.window_seconds
-        estimated_count = self.previous_window_count * weight + self.current_window_count
-        
-        if estimated_count < self.max_requests:
-            self.current_window_count += 1
-            return True
-        return False
-    
-    def get_remaining(self) -> int:
-        now = time.time()
-        elapsed = now - self.current_window_start
-        
-        if elapsed >= self.window_seconds:
-            return self.max_requests
-        
-        weight = (self.window_seconds - elapsed) / self.window_seconds
-        estimated_count = self.previous_window_count * weight + self.current_window_count
-        return max(0, int(self.max_requests - estimated_count))
+        now = time.monotonic()
+        if dropped_log_count and now - last_drop_warning >= LOG_DROP_WARN_INTERVAL:
+            logger.warning(f"Request log queue full, dropped {dropped_log_count} logs")
+            dropped_log_count = 0
+            last_drop_warning = now
 
 # ==================== RATE LIMITER MIDDLEWARE ====================
 
+# Rate limit configs cached per API key so the hot path doesn't hit
+# MongoDB on every request. Each worker has its own cache, so a config
+# change made through another worker takes effect here within the TTL.
+# Keys without a config are cached only briefly, so a newly created
+# config is picked up quickly.
+CONFIG_CACHE_TTL = 5  # seconds
+CONFIG_MISS_CACHE_TTL = 1  # seconds
+config_cache: TTLCache = TTLCache(maxsize=LIMITER_CACHE_SIZE, ttl=CONFIG_CACHE_TTL)
+config_miss_cache: TTLCache = TTLCache(maxsize=LIMITER_CACHE_SIZE, ttl=CONFIG_MISS_CACHE_TTL)
+# Bumped whenever a key's config changes, so a lookup that was already
+# in flight doesn't put the old config back into the cache. Bounded like
+# the other per-key stores; losing an entry only costs one uncached lookup.
+config_generations: LRUCache = LRUCache(maxsize=LIMITER_CACHE_SIZE)
+
+def invalidate_config_cache(api_key: str):
+    """Drop the cached config for an API key and any lookup still in flight"""
+    config_generations[api_key] = config_generations.get(api_key, 0) + 1
+    config_cache.pop(api_key, None)
+    config_miss_cache.pop(api_key, None)
+
 async def get_rate_limit_config(api_key: str) -> Optional[RateLimitConfig]:
     """Get rate limit configuration for an API key"""
+    try:
+        return config_cache[api_key]
+    except KeyError:
+        pass
+    if api_key in config_miss_cache:
+        return None
+    
+    generation = config_generations.get(api_key, 0)
     config = await db.rate_limit_configs.find_one({"api_key": api_key}, {"_id": 0})
     if config:
-        if isinstance(config['created_at'], str):
-            config['created_at'] = datetime.fromisoformat(config['created_at'])
-        return RateLimitConfig(**config)
-    return None
+        config = RateLimitConfig(**config)
+    if config_generations.get(api_key, 0) == generation:
+        if config:
+            config_cache[api_key] = config
+        else:
+            config_miss_cache[api_key] = True
+    return config
 
 async def check_rate_limit(api_key: str, endpoint: str) -> tuple[bool, int, str]:
     """Check if request is allowed based on rate limit configuration"""
+    global dropped_log_count
     config = await get_rate_limit_config(api_key)
     
     if not config:
@@ -241,47 +247,44 @@ async def check_rate_limit(api_key: str, endpoint: str) -> tuple[bool, int, str]
     
     algorithm = config.algorithm
     key = f"{api_key}:{algorithm}"
+    now = time.monotonic()
     
     allowed = False
     remaining = 0
     
-    if algorithm == "token_bucket":
-        if key not in token_buckets:
-            refill_rate = config.max_requests / config.window_seconds
-            token_buckets[key] = TokenBucket(config.max_requests, refill_rate)
-        allowed = token_buckets[key].consume()
-        remaining = token_buckets[key].get_remaining()
-    
-    elif algorithm == "leaky_bucket":
-        if key not in leaky_buckets:
-            leak_rate = config.max_requests / config.window_seconds
-            leaky_buckets[key] = LeakyBucket(config.max_requests, leak_rate)
-        allowed = leaky_buckets[key].add_request()
-        remaining = leaky_buckets[key].get_remaining()
-    
-    elif algorithm == "fixed_window":
-        if key not in fixed_windows:
-            fixed_windows[key] = FixedWindow(config.max_requests, config.window_seconds)
-        allowed = fixed_windows[key].allow_request()
-        remaining = fixed_windows[key].get_remaining()
-    
-    elif algorithm == "sliding_window":
-        if key not in sliding_windows:
-            sliding_windows[key] = SlidingWindowCounter(config.max_requests, config.window_seconds)
-        allowed = sliding_windows[key].allow_request()
-        remaining = sliding_windows[key].get_remaining()
-    
-    # Log the request
-    log = RequestLog(
-        api_key=api_key,
-        endpoint=endpoint,
-        algorithm=algorithm,
-        allowed=allowed,
-        remaining_quota=remaining
-    )
-    log_dict = log.model_dump()
-    log_dict['timestamp'] = log_dict['timestamp'].isoformat()
-    await db.request_logs.insert_one(log_dict)
+    if rate_limit_script:
+        # Single atomic EVALSHA against the shared Redis state
+        result = await rate_limit_script(
+            keys=[f"rate_limit:{key}"],
+            args=[algorithm, config.max_requests, config.window_seconds]
+        )
+        allowed, remaining = bool(result[0]), int(result[1])
+    
+    else:
+        limiter_type = RATE_LIMITERS.get(algorithm)
+        if limiter_type:
+            storage, factory, allow, get_remaining = limiter_type
+            limiter = storage.get(key)
+            if limiter is None:
+                limiter = storage[key] = factory(config, now)
+            allowed = allow(limiter, now)
+            remaining = get_remaining(limiter, now)
+    
+    # Log the request. Built as a plain dict with the RequestLog fields to
+    # skip model validation on the hot path.
+    log_dict = {
+        "id": uuid.uuid4().hex,
+        "api_key": api_key,
+        "endpoint": endpoint,
+        "algorithm": algorithm,
+        "allowed": allowed,
+        "timestamp": datetime.now(timezone.utc),
+        "remaining_quota": remaining
+    }
+    try:
+        log_queue.put_nowait(log_dict)
+    except asyncio.QueueFull:
+        dropped_log_count += 1
     
     return allowed, remaining, algorithm
 
@@ -296,18 +299,18 @@ async def create_api_key(input: APIKeyCreate):
     """Create a new API key"""
     api_key_obj = APIKeyModel(name=input.name)
     doc = api_key_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.api_keys.insert_one(doc)
     return api_key_obj
 
-@api_router.get("/api-keys", response_model=List[APIKeyModel])
+# List endpoints return the Mongo documents straight to orjson; the model
+# is only declared for the OpenAPI docs and isn't used to revalidate them.
+@api_router.get("/api-keys", responses={200: {"model": List[APIKeyModel]}})
 async def get_api_keys():
     """Get all API keys"""
-    keys = await db.api_keys.find({}, {"_id": 0}).to_list(1000)
-    for key in keys:
-        if isinstance(key['created_at'], str):
-            key['created_at'] = datetime.fromisoformat(key['created_at'])
-    return keys
+    keys = await db.api_keys.find(
+        {}, {"_id": 0, "id": 1, "api_key": 1, "name": 1, "created_at": 1, "is_active": 1}
+    ).limit(1000).to_list(1000)
+    return ORJSONResponse(keys)
 
 @api_router.post("/rate-limit-configs", response_model=RateLimitConfig)
 async def create_rate_limit_config(input: RateLimitConfigCreate):
@@ -317,30 +320,29 @@ async def create_rate_limit_config(input: RateLimitConfigCreate):
     if not api_key_doc:
         raise HTTPException(status_code=404, detail="API key not found")
     
-    # Delete existing config for this API key if any
-    await db.rate_limit_configs.delete_many({"api_key": input.api_key})
-    
     config = RateLimitConfig(**input.model_dump())
     doc = config.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.rate_limit_configs.insert_one(doc)
+    # Replace existing config for this API key if any (api_key is unique)
+    await db.rate_limit_configs.replace_one({"api_key": input.api_key}, doc, upsert=True)
     
     # Clear in-memory cache for this key
-    for storage in [token_buckets, leaky_buckets, fixed_windows, sliding_windows]:
-        keys_to_delete = [k for k in storage.keys() if k.startswith(input.api_key)]
-        for k in keys_to_delete:
-            del storage[k]
+    invalidate_config_cache(input.api_key)
+    # Limiter keys are always "{api_key}:{algorithm}", so delete them directly
+    limiter_keys = {algo: f"{input.api_key}:{algo}" for algo in RATE_LIMITERS}
+    if redis_client:
+        await redis_client.delete(*[f"rate_limit:{key}" for key in limiter_keys.values()])
+    for algo, (storage, *_) in RATE_LIMITERS.items():
+        storage.pop(limiter_keys[algo], None)
     
     return config
 
-@api_router.get("/rate-limit-configs", response_model=List[RateLimitConfig])
+@api_router.get("/rate-limit-configs", responses={200: {"model": List[RateLimitConfig]}})
 async def get_rate_limit_configs():
     """Get all rate limit configurations"""
-    configs = await db.rate_limit_configs.find({}, {"_id": 0}).to_list(1000)
-    for config in configs:
-        if isinstance(config['created_at'], str):
-            config['created_at'] = datetime.fromisoformat(config['created_at'])
-    return configs
+    configs = await db.rate_limit_configs.find(
+        {}, {"_id": 0, "id": 1, "api_key": 1, "algorithm": 1, "max_requests": 1, "window_seconds": 1, "created_at": 1}
+    ).limit(1000).to_list(1000)
+    return ORJSONResponse(configs)
 
 @api_router.get("/protected/test")
 async def protected_test_endpoint(api_key: str):
@@ -348,7 +350,7 @@ async def protected_test_endpoint(api_key: str):
     allowed, remaining, algorithm = await check_rate_limit(api_key, "/api/protected/test")
     
     if not allowed:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=429,
             content={
                 "error": "Rate limit exceeded",
@@ -362,7 +364,7 @@ async def protected_test_endpoint(api_key: str):
         "message": "Request allowed",
         "algorithm": algorithm,
         "remaining_quota": remaining,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
 
 @api_router.get("/analytics/summary")
@@ -372,22 +374,44 @@ async def get_analytics_summary(api_key: Optional[str] = None):
     if api_key:
         query["api_key"] = api_key
     
-    total_requests = await db.request_logs.count_documents(query)
-    allowed_requests = await db.request_logs.count_documents({**query, "allowed": True})
-    blocked_requests = await db.request_logs.count_documents({**query, "allowed": False})
+    # Count logs per (algorithm, allowed) in a single aggregation
+    pipeline = [
+        {"$match": query},
+        {"$group": {"_id": {"algorithm": "$algorithm", "allowed": "$allowed"}, "count": {"$sum": 1}}}
+    ]
+    rows = await db.request_logs.aggregate(pipeline).to_list(None)
+    
+    total_requests = 0
+    allowed_requests = 0
+    blocked_requests = 0
+    algorithm_counts = {
+        algo: {"total": 0, "allowed": 0, "blocked": 0}
+        for algo in ["token_bucket", "leaky_bucket", "fixed_window", "sliding_window"]
+    }
+    for row in rows:
+        count = row["count"]
+        allowed = row["_id"].get("allowed")
+        total_requests += count
+        if allowed is True:
+            allowed_requests += count
+        elif allowed is False:
+            blocked_requests += count
+        
+        counts = algorithm_counts.get(row["_id"].get("algorithm"))
+        if counts:
+            counts["total"] += count
+            if allowed is True:
+                counts["allowed"] += count
+            elif allowed is False:
+                counts["blocked"] += count
     
     # Get algorithm breakdown
     algorithm_stats = {}
-    for algo in ["token_bucket", "leaky_bucket", "fixed_window", "sliding_window"]:
-        algo_query = {**query, "algorithm": algo}
-        total = await db.request_logs.count_documents(algo_query)
-        allowed = await db.request_logs.count_documents({**algo_query, "allowed": True})
-        blocked = await db.request_logs.count_documents({**algo_query, "allowed": False})
+    for algo, counts in algorithm_counts.items():
+        total = counts["total"]
         algorithm_stats[algo] = {
-            "total": total,
-            "allowed": allowed,
-            "blocked": blocked,
-            "success_rate": round(allowed / total * 100, 2) if total > 0 else 0
+            **counts,
+            "success_rate": round(counts["allowed"] / total * 100, 2) if total > 0 else 0
         }
     
     return {
@@ -405,13 +429,9 @@ async def get_recent_logs(limit: int = 100, api_key: Optional[str] = None):
     if api_key:
         query["api_key"] = api_key
     
-    logs = await db.request_logs.find(query, {"_id": 0}).sort("timestamp", -1).limit(limit).to_list(limit)
-    
-    for log in logs:
-        if isinstance(log['timestamp'], str):
-            log['timestamp'] = datetime.fromisoformat(log['timestamp'])
-    
-    return logs
+    # The endpoint path is not shown in the dashboard, so it isn't fetched
+    logs = await db.request_logs.find(query, {"_id": 0, "endpoint": 0}).sort("timestamp", -1).limit(limit).to_list(limit)
+    return ORJSONResponse(logs)
 
 @api_router.post("/load-test")
 async def run_load_test(test_request: LoadTestRequest):
@@ -433,30 +453,35 @@ async def run_load_test(test_request: LoadTestRequest):
         "total_requests": total_requests,
         "allowed": 0,
         "blocked": 0,
-        "start_time": datetime.now(timezone.utc).isoformat(),
+        "start_time": datetime.now(timezone.utc),
         "requests_per_second": rps,
         "duration_seconds": duration
     }
     
-    start_time = time.time()
+    start_time = time.monotonic()
     
+    # Fire each request as its own task so slow checks overlap instead of
+    # holding back the send rate
+    tasks = []
     for i in range(total_requests):
-        allowed, remaining, algorithm = await check_rate_limit(api_key, endpoint)
+        tasks.append(asyncio.create_task(check_rate_limit(api_key, endpoint)))
+        
+        # Sleep until the next send slot to maintain target RPS
+        next_send = start_time + (i + 1) * delay_between_requests
+        await asyncio.sleep(max(0.0, next_send - time.monotonic()))
         
+        # Check if duration exceeded
+        if time.monotonic() - start_time > duration:
+            break
+    
+    for allowed, remaining, algorithm in await asyncio.gather(*tasks):
         if allowed:
             results["allowed"] += 1
         else:
             results["blocked"] += 1
-        
-        # Sleep to maintain target RPS
-        await asyncio.sleep(delay_between_requests)
-        
-        # Check if duration exceeded
-        if time.time() - start_time > duration:
-            break
     
-    results["end_time"] = datetime.now(timezone.utc).isoformat()
-    results["actual_duration"] = time.time() - start_time
+    results["end_time"] = datetime.now(timezone.utc)
+    results["actual_duration"] = time.monotonic() - start_time
     results["success_rate"] = round(results["allowed"] / total_requests * 100, 2) if total_requests > 0 else 0
     
     return results
@@ -466,31 +491,50 @@ async def reset_stats():
     """Reset all statistics and in-memory storage"""
     await db.request_logs.delete_many({})
     
+    config_cache.clear()
+    config_miss_cache.clear()
     token_buckets.clear()
     leaky_buckets.clear()
     fixed_windows.clear()
     sliding_windows.clear()
+    if redis_client:
+        keys = [k async for k in redis_client.scan_iter(match="rate_limit:*")]
+        if keys:
+            await redis_client.delete(*keys)
     
     return {"message": "Statistics and rate limiters reset successfully"}
 
+async def count_active_limiters() -> Dict[str, int]:
+    """Count live limiters per algorithm in whichever store holds them"""
+    if not redis_client:
+        return {algo: len(storage) for algo, (storage, *_) in RATE_LIMITERS.items()}
+    
+    # Redis keys are "rate_limit:{api_key}:{algorithm}" and expire when idle
+    counts = dict.fromkeys(RATE_LIMITERS, 0)
+    async for key in redis_client.scan_iter(match="rate_limit:*", count=1000):
+        algo = key.rsplit(b":", 1)[-1].decode()
+        if algo in counts:
+            counts[algo] += 1
+    return counts
+
 @api_router.get("/system-status")
 async def get_system_status():
     """Get system status and active rate limiters"""
-    total_api_keys = await db.api_keys.count_documents({})
-    total_configs = await db.rate_limit_configs.count_documents({})
-    total_logs = await db.request_logs.count_documents({})
+    total_api_keys, total_configs, total_logs, active_limiters = await asyncio.gather(
+        db.api_keys.count_documents({}),
+        db.rate_limit_configs.count_documents({}),
+        db.request_logs.count_documents({}),
+        count_active_limiters()
+    )
     
     return {
         "status": "operational",
         "active_api_keys": total_api_keys,
         "active_configs": total_configs,
         "total_requests_logged": total_logs,
-        "active_rate_limiters": {
-            "token_bucket": len(token_buckets),
-            "leaky_bucket": len(leaky_buckets),
-            "fixed_window": len(fixed_windows),
-            "sliding_window": len(sliding_windows)
-        }
+        "rate_limit_backend": "redis" if redis_client else "memory",
+        "active_rate_limiters": active_limiters,
+        "cached_configs": len(config_cache)
     }
 
 # Include the router in the main app
@@ -505,6 +549,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def connect_db_client():
+    # Connect now rather than on the first request. MongoDB may still be
+    # starting (e.g. a cold container), so retry with backoff before giving up.
+    delay = MONGO_CONNECT_BACKOFF
+    for attempt in range(1, MONGO_CONNECT_ATTEMPTS + 1):
+        try:
+            await client.admin.command("ping")
+            return
+        except ConnectionFailure as e:
+            if attempt == MONGO_CONNECT_ATTEMPTS:
+                raise
+            logger.warning(f"MongoDB not reachable (attempt {attempt}/{MONGO_CONNECT_ATTEMPTS}): {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MONGO_CONNECT_MAX_BACKOFF)
+
+@app.on_event("startup")
+async def create_indexes():
+    await db.api_keys.create_index("api_key", unique=True)
+    await db.rate_limit_configs.create_index("api_key", unique=True)
+    await db.request_logs.create_index([("api_key", 1), ("timestamp", -1)])
+    await db.request_logs.create_index([("api_key", 1), ("algorithm", 1), ("allowed", 1)])
+    # Also expires request logs after a day
+    await db.request_logs.create_index("timestamp", expireAfterSeconds=86400)
+
+@app.on_event("startup")
+async def start_request_log_writer():
+    global log_writer_task
+    log_writer_task = asyncio.create_task(request_log_writer())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    if log_writer_task:
+        log_writer_task.cancel()
+        await asyncio.gather(log_writer_task, return_exceptions=True)
+    try:
+        # Persist any logs still waiting in the queue
+        await flush_request_logs()
+    except Exception as e:
+        logger.error(f"Failed to write request logs: {e}")
+    finally:
+        client.close()
+        if redis_client:
+            await redis_client.aclose()
\ No newline at end of file
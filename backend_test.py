@@ -4,21 +4,77 @@ Comprehensive Backend API Testing for Rate Limiter System
 Tests all 4 rate limiting algorithms and API endpoints
 """
 
+import argparse
+from collections import Counter
 import requests
+from requests.adapters import HTTPAdapter
+import asyncio
+import httpx
+import itertools
+import os
 import sys
-import time
 import json
 from datetime import datetime
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # fall back to the stdlib parser
+    _loads = json.loads
+
+# Compact JSON encoder for request bodies; make_request and _request encode the
+# dict themselves and hand the bytes to the HTTP clients
+_ENC = json.JSONEncoder(separators=(',', ':')).encode
+
+# Fields each endpoint's response must contain
+_ANALYTICS_FIELDS = frozenset({'total_requests', 'allowed_requests', 'blocked_requests', 'success_rate', 'algorithm_stats'})
+_STATUS_FIELDS = frozenset({'status', 'active_api_keys', 'active_configs', 'total_requests_logged'})
+_LOAD_FIELDS = frozenset({'total_requests', 'allowed', 'blocked', 'success_rate'})
+
+# Verbose burst output templates
+_ALLOW_FMT = "  Request {}: ✅ Allowed (remaining: {})".format
+_BLOCK_FMT = "  Request {}: 🚫 Blocked (rate limit exceeded)".format
+_UNEXPECTED_FMT = "  Request {}: ❓ Unexpected status {}: {}".format
+
 class RateLimiterAPITester:
-    def __init__(self, base_url="https://dev-hiring-portal.preview.emergentagent.com"):
+    # Spacing between burst requests per algorithm. The buckets need a true
+    # burst to show rejections; the window counters are paced lightly, with
+    # the whole burst still well inside a single window.
+    DELAY = {
+        'token_bucket': 0.0,
+        'leaky_bucket': 0.0,
+        'fixed_window': 0.02,
+        'sliding_window': 0.02
+    }
+    
+    # Each burst sends max_requests + EXTRA_REQUESTS, so exactly EXTRA_REQUESTS should be blocked
+    EXTRA_REQUESTS = 5
+    # Allowed shortfall in either count; RATE_LIMIT_TOLERANCE tightens or loosens it for CI
+    TOLERANCE = int(os.environ.get('RATE_LIMIT_TOLERANCE', 2))
+    
+    def __init__(self, base_url="https://dev-hiring-portal.preview.emergentagent.com", verbose: bool = False):
         self.base_url = base_url
+        self.verbose = verbose  # print every burst request, not just the per-test summary
         self.api_url = f"{base_url}/api"
         self.tests_run = 0
         self.tests_passed = 0
         self.created_api_keys = []
         self.created_configs = []
+        self._name_counter = itertools.count()  # unique test key names within a run
+        
+        # Reuse keep-alive connections instead of a new TCP/TLS handshake per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+        
+        # Throwaway request so the TLS setup and first connection aren't billed to the first test
+        try:
+            self.session.get(self.base_url, timeout=5)
+        except requests.RequestException:
+            pass
         
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test result"""
@@ -33,21 +89,23 @@ class RateLimiterAPITester:
     def make_request(self, method: str, endpoint: str, data: dict = None, params: dict = None) -> tuple[bool, dict, int]:
         """Make HTTP request and return success, response data, status code"""
         url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
+        kwargs = {'timeout': 10}
+        if params:
+            kwargs['params'] = params
         
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = self.session.get(url, **kwargs)
             elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
+                response = self.session.post(url, data=_ENC(data).encode('utf-8'), **kwargs)
             elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=10)
+                response = self.session.delete(url, **kwargs)
             else:
                 return False, {}, 0
                 
             try:
-                response_data = response.json()
-            except:
+                response_data = _loads(response.content)
+            except ValueError:  # includes orjson.JSONDecodeError
                 response_data = {"raw_response": response.text}
                 
             return response.status_code < 400, response_data, response.status_code
@@ -55,19 +113,63 @@ class RateLimiterAPITester:
         except Exception as e:
             return False, {"error": str(e)}, 0
 
+    def _client_session(self) -> httpx.AsyncClient:
+        """Create an async client whose connections are shared by concurrent tests.
+        HTTP/2 multiplexes them over one connection where the server negotiates it, else HTTP/1.1 keep-alive."""
+        return httpx.AsyncClient(
+            base_url=self.api_url,
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+            headers={'Content-Type': 'application/json'}
+        )
+
+    async def _request(self, session: httpx.AsyncClient, method: str, endpoint: str,
+                       data: dict = None, params: dict = None) -> tuple[bool, dict, int]:
+        """Async counterpart of make_request on a shared client"""
+        kwargs = {}
+        if data is not None:
+            kwargs['content'] = _ENC(data).encode('utf-8')
+        if params:
+            kwargs['params'] = params
+        
+        try:
+            response = await session.request(method, endpoint, **kwargs)
+            try:
+                response_data = _loads(response.content)
+            except ValueError:
+                response_data = {"raw_response": response.text}
+            
+            return response.status_code < 400, response_data, response.status_code
+        
+        except Exception as e:
+            return False, {"error": str(e)}, 0
+
+    async def _status_only(self, session: httpx.AsyncClient, endpoint: str, params: dict = None) -> int:
+        """GET an endpoint and return just its status code, leaving the body undecoded"""
+        try:
+            response = await session.get(endpoint, params=params)
+            return response.status_code
+        except Exception:
+            return 0
+
     def test_api_root(self) -> bool:
         """Test API root endpoint"""
         success, data, status = self.make_request('GET', '')
         return self.log_test(
             "API Root Endpoint", 
-            success and status == 200 and "Rate Limiter System API" in str(data),
+            (success and status == 200 and isinstance(data, dict)
+             and data.get('message', '').startswith('Rate Limiter System API')),
             f"Status: {status}, Response: {data}"
         )
 
     def test_create_api_key(self, name: str) -> Optional[str]:
         """Test API key creation and return the API key"""
         success, data, status = self.make_request('POST', 'api-keys', {'name': name})
-        
+        return self._record_api_key(name, success, data, status)
+
+    def _record_api_key(self, name: str, success: bool, data: dict, status: int) -> Optional[str]:
+        """Log an API key creation response and return the API key"""
         if success and status == 200 and 'api_key' in data:
             api_key = data['api_key']
             self.created_api_keys.append(api_key)
@@ -86,17 +188,20 @@ class RateLimiterAPITester:
         else:
             return self.log_test("Get API Keys", False, f"Status: {status}, Response: {data}")
 
-    def test_create_rate_limit_config(self, api_key: str, algorithm: str, max_requests: int, window_seconds: int) -> bool:
-        """Test rate limit configuration creation"""
+    async def _create_rate_limit_config(self, session: httpx.AsyncClient, api_key: str, algorithm: str,
+                                        max_requests: int, window_seconds: int) -> tuple[bool, dict, int]:
+        """POST a rate limit configuration; the caller logs the response with _record_rate_limit_config"""
         config_data = {
             'api_key': api_key,
             'algorithm': algorithm,
             'max_requests': max_requests,
             'window_seconds': window_seconds
         }
-        
-        success, data, status = self.make_request('POST', 'rate-limit-configs', config_data)
-        
+        return await self._request(session, 'POST', 'rate-limit-configs', config_data)
+
+    def _record_rate_limit_config(self, algorithm: str, max_requests: int, window_seconds: int,
+                                  success: bool, data: dict, status: int) -> bool:
+        """Log a rate limit config creation response"""
         if success and status == 200:
             self.created_configs.append(data.get('id'))
             return self.log_test(
@@ -111,46 +216,111 @@ class RateLimiterAPITester:
                 f"Status: {status}, Response: {data}"
             )
 
-    def test_get_rate_limit_configs(self) -> bool:
+    async def test_get_rate_limit_configs(self, session: httpx.AsyncClient) -> bool:
         """Test getting all rate limit configurations"""
-        success, data, status = self.make_request('GET', 'rate-limit-configs')
+        success, data, status = await self._request(session, 'GET', 'rate-limit-configs')
         
         if success and status == 200 and isinstance(data, list):
             return self.log_test("Get Rate Limit Configs", True, f"Found {len(data)} configs")
         else:
             return self.log_test("Get Rate Limit Configs", False, f"Status: {status}, Response: {data}")
 
-    def test_protected_endpoint_rate_limiting(self, api_key: str, algorithm: str, max_requests: int) -> Dict[str, int]:
-        """Test rate limiting on protected endpoint"""
-        allowed_count = 0
-        blocked_count = 0
+    async def _fire_burst(self, session: httpx.AsyncClient, api_key: str, n: int,
+                          delay: float = 0.0) -> List[tuple]:
+        """Send n requests to the protected endpoint, started delay seconds apart, and return (status, data) tuples.
+        Bodies are only decoded in verbose mode; otherwise data is an empty dict."""
+        params = {'api_key': api_key}
+        
+        async def fire(i: int):
+            d = i * delay
+            if d:
+                await asyncio.sleep(d)
+            if self.verbose:
+                _, data, status = await self._request(session, 'GET', 'protected/test', params=params)
+                return status, data
+            return await self._status_only(session, 'protected/test', params), {}
+        
+        return await asyncio.gather(*(fire(i) for i in range(n)))
+
+    async def _setup_algo(self, session: httpx.AsyncClient, algorithm: str,
+                          max_req: int, window: int) -> Dict[str, any]:
+        """Create a fresh API key and rate limit config for one algorithm"""
+        setup = {
+            "algorithm": algorithm,
+            "max_requests": max_req,
+            "window": window,
+            "key_name": f"test_{algorithm}_{next(self._name_counter)}",
+            "config_response": None
+        }
         
-        print(f"\n🔄 Testing {algorithm} rate limiting with {max_requests} max requests...")
+        setup["key_response"] = await self._request(
+            session, 'POST', 'api-keys', {'name': setup["key_name"]}
+        )
+        key_success, key_data, _ = setup["key_response"]
+        if key_success and 'api_key' in key_data:
+            setup["config_response"] = await self._create_rate_limit_config(
+                session, key_data['api_key'], algorithm, max_req, window
+            )
+        return setup
+
+    async def _run_algorithm_tests(self, session: httpx.AsyncClient, algorithms: List[tuple]) -> List[tuple]:
+        """Set up and burst-test every algorithm concurrently over the shared client.
+        Returns (algorithm, max_requests, burst results) per algorithm whose API key was created."""
+        # Each algorithm gets its own fresh API key, so all setups go out in one batch
+        setups = await asyncio.gather(*(
+            self._setup_algo(session, algorithm, max_req, window)
+            for algorithm, max_req, window in algorithms
+        ))
+        
+        ready = []
+        for setup in setups:
+            api_key = self._record_api_key(setup["key_name"], *setup["key_response"])
+            if api_key:
+                self._record_rate_limit_config(
+                    setup["algorithm"], setup["max_requests"], setup["window"], *setup["config_response"]
+                )
+                ready.append((setup["algorithm"], api_key, setup["max_requests"]))
+        
+        await asyncio.sleep(1)  # Allow configs to take effect
         
         # Make requests up to the limit + extra to test blocking
-        test_requests = max_requests + 5
+        bursts = await asyncio.gather(*(
+            self._fire_burst(session, api_key, max_req + self.EXTRA_REQUESTS, self.DELAY[algorithm])
+            for algorithm, api_key, max_req in ready
+        ))
         
-        for i in range(test_requests):
-            success, data, status = self.make_request('GET', 'protected/test', params={'api_key': api_key})
-            
-            if status == 200:
-                allowed_count += 1
-                print(f"  Request {i+1}: ✅ Allowed (remaining: {data.get('remaining_quota', 'N/A')})")
-            elif status == 429:
-                blocked_count += 1
-                print(f"  Request {i+1}: 🚫 Blocked (rate limit exceeded)")
-            else:
-                print(f"  Request {i+1}: ❓ Unexpected status {status}: {data}")
-            
-            # Small delay between requests for some algorithms
-            time.sleep(0.1)
+        return [(algorithm, max_req, burst) for (algorithm, _, max_req), burst in zip(ready, bursts)]
+
+    def test_protected_endpoint_rate_limiting(self, algorithm: str, max_requests: int, results: List[tuple]) -> Dict[str, int]:
+        """Test rate limiting on protected endpoint from a burst's (status, data) results"""
+        print(f"\n🔄 Testing {algorithm} rate limiting with {max_requests} max requests...")
+        
+        test_requests = len(results)
+        counts = Counter(status for status, _ in results)
+        allowed_count = counts[200]
+        blocked_count = counts[429]
+        
+        unexpected = sorted(status for status in counts if status not in (200, 429))
+        if unexpected and not self.verbose:
+            print(f"  ❓ {test_requests - allowed_count - blocked_count} request(s) with unexpected status {unexpected}")
+        
+        if self.verbose:
+            log_lines = []
+            for i, (status, data) in enumerate(results, 1):
+                if status == 200:
+                    log_lines.append(_ALLOW_FMT(i, data.get('remaining_quota', 'N/A')))
+                elif status == 429:
+                    log_lines.append(_BLOCK_FMT(i))
+                else:
+                    log_lines.append(_UNEXPECTED_FMT(i, status, data))
+            sys.stdout.write("\n".join(log_lines) + "\n")
         
         # Verify rate limiting worked correctly
-        expected_allowed = min(max_requests, test_requests)
-        expected_blocked = max(0, test_requests - max_requests)
+        # Bursts are always max_requests + EXTRA_REQUESTS long, so the expected split is fixed
+        expected_allowed, expected_blocked = max_requests, self.EXTRA_REQUESTS
         
-        success = (allowed_count >= expected_allowed - 2 and  # Allow some tolerance
-                  blocked_count >= expected_blocked - 2)
+        success = (allowed_count + self.TOLERANCE >= expected_allowed and
+                   blocked_count + self.TOLERANCE >= expected_blocked)
         
         self.log_test(
             f"Rate Limiting Test ({algorithm})",
@@ -160,39 +330,37 @@ class RateLimiterAPITester:
         
         return {"allowed": allowed_count, "blocked": blocked_count}
 
-    def test_analytics_summary(self) -> bool:
+    async def test_analytics_summary(self, session: httpx.AsyncClient) -> bool:
         """Test analytics summary endpoint"""
-        success, data, status = self.make_request('GET', 'analytics/summary')
+        success, data, status = await self._request(session, 'GET', 'analytics/summary')
         
         if success and status == 200:
-            required_fields = ['total_requests', 'allowed_requests', 'blocked_requests', 'success_rate', 'algorithm_stats']
-            has_all_fields = all(field in data for field in required_fields)
+            has_all_fields = _ANALYTICS_FIELDS.issubset(data)
             return self.log_test("Analytics Summary", has_all_fields, f"Data: {data}")
         else:
             return self.log_test("Analytics Summary", False, f"Status: {status}, Response: {data}")
 
-    def test_recent_logs(self) -> bool:
+    async def test_recent_logs(self, session: httpx.AsyncClient) -> bool:
         """Test recent logs endpoint"""
-        success, data, status = self.make_request('GET', 'analytics/recent-logs', params={'limit': 10})
+        success, data, status = await self._request(session, 'GET', 'analytics/recent-logs', params={'limit': 10})
         
         if success and status == 200 and isinstance(data, list):
             return self.log_test("Recent Logs", True, f"Found {len(data)} log entries")
         else:
             return self.log_test("Recent Logs", False, f"Status: {status}, Response: {data}")
 
-    def test_system_status(self) -> bool:
+    async def test_system_status(self, session: httpx.AsyncClient) -> bool:
         """Test system status endpoint"""
-        success, data, status = self.make_request('GET', 'system-status')
+        success, data, status = await self._request(session, 'GET', 'system-status')
         
         if success and status == 200:
-            required_fields = ['status', 'active_api_keys', 'active_configs', 'total_requests_logged']
-            has_all_fields = all(field in data for field in required_fields)
+            has_all_fields = _STATUS_FIELDS.issubset(data)
             return self.log_test("System Status", has_all_fields, f"Status: {data.get('status')}")
         else:
             return self.log_test("System Status", False, f"Status: {status}, Response: {data}")
 
-    def test_load_test_endpoint(self, api_key: str) -> bool:
-        """Test load test functionality"""
+    def _start_load_test(self, session: httpx.AsyncClient, api_key: str) -> asyncio.Task:
+        """Start the server-side load test in the background; its result is checked by test_load_test_endpoint"""
         load_test_data = {
             'api_key': api_key,
             'requests_per_second': 5,
@@ -202,11 +370,14 @@ class RateLimiterAPITester:
         
         print(f"\n🔄 Running load test: {load_test_data['requests_per_second']} RPS for {load_test_data['duration_seconds']}s...")
         
-        success, data, status = self.make_request('POST', 'load-test', load_test_data)
+        return asyncio.create_task(self._request(session, 'POST', 'load-test', load_test_data))
+
+    async def test_load_test_endpoint(self, load_task: asyncio.Task) -> bool:
+        """Test load test functionality"""
+        success, data, status = await load_task
         
         if success and status == 200:
-            required_fields = ['total_requests', 'allowed', 'blocked', 'success_rate']
-            has_all_fields = all(field in data for field in required_fields)
+            has_all_fields = _LOAD_FIELDS.issubset(data)
             return self.log_test(
                 "Load Test", 
                 has_all_fields, 
@@ -215,9 +386,17 @@ class RateLimiterAPITester:
         else:
             return self.log_test("Load Test", False, f"Status: {status}, Response: {data}")
 
-    def test_reset_stats(self) -> bool:
+    async def _run_monitoring_tests(self, session: httpx.AsyncClient) -> List[bool]:
+        """Run the analytics and status checks concurrently; all are independent reads"""
+        return await asyncio.gather(
+            self.test_analytics_summary(session),
+            self.test_recent_logs(session),
+            self.test_system_status(session)
+        )
+
+    async def test_reset_stats(self, session: httpx.AsyncClient) -> bool:
         """Test reset statistics endpoint"""
-        success, data, status = self.make_request('DELETE', 'reset-stats')
+        success, data, status = await self._request(session, 'DELETE', 'reset-stats')
         
         if success and status == 200:
             return self.log_test("Reset Stats", True, "Statistics reset successfully")
@@ -226,6 +405,22 @@ class RateLimiterAPITester:
 
     def run_comprehensive_tests(self) -> Dict[str, any]:
         """Run all tests and return results"""
+        try:
+            return asyncio.run(self._run_async())
+        finally:
+            self.session.close()
+
+    async def _run_async(self) -> Dict[str, any]:
+        """Run all tests on one event loop and shared client, so the load test can overlap the rest"""
+        async with self._client_session() as session:
+            # Most of the run goes through this client, so warm it up too (connection, TLS, HTTP/2 setup)
+            try:
+                await session.get('', timeout=5.0)
+            except httpx.HTTPError:
+                pass
+            return await self._run_all(session)
+
+    async def _run_all(self, session: httpx.AsyncClient) -> Dict[str, any]:
         print("🚀 Starting Comprehensive Rate Limiter API Tests")
         print(f"🌐 Testing against: {self.base_url}")
         print("=" * 60)
@@ -249,7 +444,7 @@ class RateLimiterAPITester:
             return results
         
         # Test 2: API Key Management
-        test_key_name = f"test_key_{int(time.time())}"
+        test_key_name = f"test_key_{next(self._name_counter)}"
         api_key = self.test_create_api_key(test_key_name)
         
         if api_key:
@@ -274,9 +469,15 @@ class RateLimiterAPITester:
             ("sliding_window", 15, 60)
         ]
         
+        # The POSTs go out concurrently on the shared client; results are logged in order afterwards
+        config_responses = await asyncio.gather(*(
+            self._create_rate_limit_config(session, api_key, algorithm, max_req, window)
+            for algorithm, max_req, window in algorithms
+        ))
+        
         config_success = 0
-        for algorithm, max_req, window in algorithms:
-            if self.test_create_rate_limit_config(api_key, algorithm, max_req, window):
+        for (algorithm, max_req, window), response in zip(algorithms, config_responses):
+            if self._record_rate_limit_config(algorithm, max_req, window, *response):
                 config_success += 1
                 results["passed_tests"].append(f"Rate limit config creation ({algorithm})")
         
@@ -288,7 +489,11 @@ class RateLimiterAPITester:
                 "fix_priority": "CRITICAL"
             })
         
-        if self.test_get_rate_limit_configs():
+        # The server-side load test takes its full duration; now that the key is rate limited,
+        # run it behind the remaining tests
+        load_task = self._start_load_test(session, api_key)
+        
+        if await self.test_get_rate_limit_configs(session):
             results["passed_tests"].append("Rate limit config retrieval")
         
         # Test 4: Rate Limiting Algorithms
@@ -296,43 +501,40 @@ class RateLimiterAPITester:
         print("🧪 TESTING RATE LIMITING ALGORITHMS")
         print("=" * 60)
         
+        # Results are logged after the concurrent run to keep the output and counters in order
         algorithm_results = {}
-        for algorithm, max_req, window in algorithms:
-            # Create fresh API key for each algorithm test
-            test_api_key = self.test_create_api_key(f"test_{algorithm}_{int(time.time())}")
-            if test_api_key:
-                self.test_create_rate_limit_config(test_api_key, algorithm, max_req, window)
-                time.sleep(1)  # Allow config to take effect
-                
-                rate_limit_result = self.test_protected_endpoint_rate_limiting(test_api_key, algorithm, max_req)
-                algorithm_results[algorithm] = rate_limit_result
-                
-                if rate_limit_result["blocked"] > 0:
-                    results["passed_tests"].append(f"Rate limiting enforcement ({algorithm})")
-                else:
-                    results["backend_issues"]["critical_bugs"].append({
-                        "endpoint": "/api/protected/test",
-                        "issue": f"{algorithm} algorithm not blocking excess requests",
-                        "impact": "Rate limiting not working",
-                        "fix_priority": "HIGH"
-                    })
-        
-        # Test 5: Analytics and Monitoring
-        if self.test_analytics_summary():
+        for algorithm, max_req, burst in await self._run_algorithm_tests(session, algorithms):
+            rate_limit_result = self.test_protected_endpoint_rate_limiting(algorithm, max_req, burst)
+            algorithm_results[algorithm] = rate_limit_result
+            
+            if rate_limit_result["blocked"] > 0:
+                results["passed_tests"].append(f"Rate limiting enforcement ({algorithm})")
+            else:
+                results["backend_issues"]["critical_bugs"].append({
+                    "endpoint": "/api/protected/test",
+                    "issue": f"{algorithm} algorithm not blocking excess requests",
+                    "impact": "Rate limiting not working",
+                    "fix_priority": "HIGH"
+                })
+        
+        # Test 5: Analytics and Monitoring, run concurrently
+        analytics_ok, logs_ok, status_ok = await self._run_monitoring_tests(session)
+        
+        if analytics_ok:
             results["passed_tests"].append("Analytics summary")
         
-        if self.test_recent_logs():
+        if logs_ok:
             results["passed_tests"].append("Recent logs retrieval")
         
-        if self.test_system_status():
+        if status_ok:
             results["passed_tests"].append("System status check")
         
-        # Test 6: Load Testing
-        if api_key and self.test_load_test_endpoint(api_key):
+        # Test 6: Load Testing, started after the rate limit configs were created
+        if await self.test_load_test_endpoint(load_task):
             results["passed_tests"].append("Load test functionality")
         
         # Test 7: Statistics Reset
-        if self.test_reset_stats():
+        if await self.test_reset_stats(session):
             results["passed_tests"].append("Statistics reset")
         
         # Print Summary
@@ -356,7 +558,11 @@ class RateLimiterAPITester:
 
 def main():
     """Main test execution"""
-    tester = RateLimiterAPITester()
+    parser = argparse.ArgumentParser(description="Rate Limiter System backend API tests")
+    parser.add_argument('--verbose', action='store_true', help="print the outcome of every rate limit test request")
+    args = parser.parse_args()
+    
+    tester = RateLimiterAPITester(verbose=args.verbose)
     results = tester.run_comprehensive_tests()
     
     # Return appropriate exit code